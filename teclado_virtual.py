@@ -14,6 +14,7 @@ from ctypes import wintypes
 import json
 import os
 import socket
+import statistics
 
 try:
     import pyautogui
@@ -34,6 +35,7 @@ KEYEVENTF_KEYUP = 0x0002
 VK_SHIFT = 0x10
 VK_CONTROL = 0x11
 VK_MENU = 0x12  # Alt
+VK_RETURN = 0x0D
 
 
 class KEYBDINPUT(ctypes.Structure):
@@ -83,42 +85,68 @@ class INPUT(ctypes.Structure):
 # Método 1: SendInput Unicode (KEYEVENTF_UNICODE)
 # ═════════════════════════════════════════════════════════════
 
-def _enviar_scan_code(scan_code):
-    """Envía un único scan code (key-down + key-up) vía SendInput Unicode."""
+def _enviar_inputs(entradas):
+    """Envía una lista de INPUT en una sola llamada a SendInput."""
+    if not entradas:
+        return
+    arr = (INPUT * len(entradas))(*entradas)
+    ctypes.windll.user32.SendInput(len(entradas), arr, ctypes.sizeof(INPUT))
+
+
+def _input_unicode(scan_code, up=False):
+    """Construye un INPUT de teclado Unicode (key-down o key-up)."""
     inp = INPUT()
     inp.type = INPUT_KEYBOARD
     inp.ki.wVk = 0
     inp.ki.wScan = scan_code & 0xFFFF
-    inp.ki.dwExtraInfo = None
+    inp.ki.dwFlags = KEYEVENTF_UNICODE | (KEYEVENTF_KEYUP if up else 0)
     inp.ki.time = 0
-
-    inp.ki.dwFlags = KEYEVENTF_UNICODE
-    ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
-
-    inp.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
-    ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+    inp.ki.dwExtraInfo = None
+    return inp
 
 
-def _enviar_unicode(char):
-    """Envía un carácter vía SendInput Unicode. Soporta emojis (surrogate pairs)."""
+def _unidades_utf16(char):
+    """Devuelve los code units UTF-16 de un carácter (surrogate pair si está fuera del BMP)."""
     code = ord(char)
     if code > 0xFFFF:
         # Caracteres fuera del BMP (emojis, etc.) necesitan UTF-16 surrogate pairs
         code -= 0x10000
-        high_surrogate = 0xD800 + (code >> 10)
-        low_surrogate = 0xDC00 + (code & 0x3FF)
-        _enviar_scan_code(high_surrogate)
-        _enviar_scan_code(low_surrogate)
-    else:
+        return [0xD800 + (code >> 10), 0xDC00 + (code & 0x3FF)]
+    return [code]
+
+
+def _enviar_scan_code(scan_code):
+    """Envía un único scan code (key-down + key-up) vía SendInput Unicode."""
+    for up in (False, True):
+        inp = _input_unicode(scan_code, up)
+        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+
+
+def _enviar_unicode(char):
+    """Envía un carácter vía SendInput Unicode. Soporta emojis (surrogate pairs)."""
+    for code in _unidades_utf16(char):
         _enviar_scan_code(code)
 
 
+def _enviar_unicode_lote(texto):
+    """
+    Envía un texto vía SendInput Unicode en una sola llamada. El modo plan lo usa
+    con lotes de como mucho LOTE_MAX_CHARS caracteres (ver trocear_segmento).
+    """
+    entradas = []
+    for char in texto:
+        for code in _unidades_utf16(char):
+            entradas.append(_input_unicode(code))
+            entradas.append(_input_unicode(code, up=True))
+    _enviar_inputs(entradas)
+
+
 # ═════════════════════════════════════════════════════════════
 # Método 2: VkKeyScanW — simula teclas reales del layout actual
 # ═════════════════════════════════════════════════════════════
 
-def _key_event(vk, up=False):
-    """Envía key-down o key-up para un virtual key code."""
+def _input_tecla(vk, up=False):
+    """Construye un INPUT de teclado para un virtual key code."""
     inp = INPUT()
     inp.type = INPUT_KEYBOARD
     inp.ki.wVk = vk
@@ -126,14 +154,23 @@ def _key_event(vk, up=False):
     inp.ki.dwFlags = KEYEVENTF_KEYUP if up else 0
     inp.ki.time = 0
     inp.ki.dwExtraInfo = None
+    return inp
+
+
+def _key_event(vk, up=False):
+    """Envía key-down o key-up para un virtual key code."""
+    inp = _input_tecla(vk, up)
     ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
 
 
-def _enviar_vkscan(char):
-    """Envía un carácter simulando las teclas del layout (Shift/Ctrl/Alt según necesite)."""
+def _teclas_vkscan(char):
+    """
+    Devuelve la secuencia de eventos (vk, up) que produce el carácter en el layout actual,
+    o None si el layout no tiene tecla para él.
+    """
     result = ctypes.windll.user32.VkKeyScanW(ord(char))
     if result == -1 or result == 0xFFFF:
-        return False
+        return None
 
     vk = result & 0xFF
     shift_state = (result >> 8) & 0xFF
@@ -146,18 +183,42 @@ def _enviar_vkscan(char):
     if shift_state & 4:
         mods.append(VK_MENU)
 
-    for mod in mods:
-        _key_event(mod, up=False)
-
-    _key_event(vk, up=False)
-    _key_event(vk, up=True)
+    return ([(mod, False) for mod in mods]
+            + [(vk, False), (vk, True)]
+            + [(mod, True) for mod in reversed(mods)])
 
-    for mod in reversed(mods):
-        _key_event(mod, up=True)
 
+def _enviar_vkscan(char):
+    """Envía un carácter simulando las teclas del layout (Shift/Ctrl/Alt según necesite)."""
+    teclas = _teclas_vkscan(char)
+    if teclas is None:
+        return False
+    for vk, up in teclas:
+        _key_event(vk, up)
     return True
 
 
+def _enviar_vkscan_lote(texto):
+    """
+    Envía un texto simulando teclas del layout en una sola llamada a SendInput. El modo
+    plan lo usa con lotes de como mucho LOTE_MAX_CHARS caracteres (ver trocear_segmento).
+    Los saltos de línea se envían como Enter; los caracteres sin tecla caen a Unicode.
+    """
+    entradas = []
+    for char in texto:
+        if char == '\n':
+            teclas = [(VK_RETURN, False), (VK_RETURN, True)]
+        else:
+            teclas = _teclas_vkscan(char)
+        if teclas is None:
+            for code in _unidades_utf16(char):
+                entradas.append(_input_unicode(code))
+                entradas.append(_input_unicode(code, up=True))
+            continue
+        entradas.extend(_input_tecla(vk, up) for vk, up in teclas)
+    _enviar_inputs(entradas)
+
+
 # ═════════════════════════════════════════════════════════════
 # Detección de entorno (RDP / local)
 # ═════════════════════════════════════════════════════════════
@@ -185,6 +246,7 @@ def _obtener_id_entorno():
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CALIBRACION_FILE = os.path.join(BASE_DIR, "calibracion.json")
 PERFILES_DIR = os.path.join(BASE_DIR, "perfiles_calibracion")
+COSTES_DIR = os.path.join(PERFILES_DIR, "costes")
 
 # Caracteres que se prueban en la calibración
 CHARS_CALIBRACION = list(dict.fromkeys(
@@ -217,11 +279,94 @@ def _test_char_metodo(root, entry, char, metodo_fn):
     return resultado == char, resultado
 
 
+def _medir_tiempo(root, entry, metodo_fn, texto):
+    """
+    Mide cuánto tarda `texto` en aparecer completo en el Entry de prueba.
+    Retorna None si el texto no aparece exactamente igual antes del límite.
+    """
+    entry.delete(0, tk.END)
+    root.update()
+    time.sleep(0.03)
+
+    t0 = time.perf_counter()
+    metodo_fn(texto)
+    limite = t0 + 2.0
+    ok = False
+    while time.perf_counter() < limite:
+        root.update()
+        if entry.get() == texto:
+            ok = True
+            break
+    transcurrido = time.perf_counter() - t0
+
+    entry.delete(0, tk.END)
+    root.update()
+    return transcurrido if ok else None
+
+
+def _medir_mediana(root, entry, metodo_fn, texto, repeticiones):
+    """Mediana de varias mediciones de `texto`; None si alguna falla."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t = _medir_tiempo(root, entry, metodo_fn, texto)
+        if t is None:
+            return None
+        tiempos.append(t)
+    return statistics.median(tiempos)
+
+
+def _medir_costes(root, entry, n=200, repeticiones=5):
+    """
+    Mide el coste de cada método: sobrecarga fija por llamada, coste por carácter
+    y, para el portapapeles, la latencia fija del pegado. Cada tiempo es la mediana
+    de varias repeticiones, y el texto largo (`n` caracteres) hace que el coste por
+    carácter quede por encima del ruido del bucle de sondeo.
+    Los métodos que fallan en la medición conservan los costes por defecto.
+    """
+    costes = {m: dict(c) for m, c in COSTES_POR_DEFECTO.items()}
+    medidos = set()
+    lotes = {
+        'unicode': _enviar_unicode_lote,
+        'vkscan': _enviar_vkscan_lote,
+        # Sin la espera interna: se mide la latencia real del pegado
+        'clipboard': lambda texto: _enviar_clipboard(texto, espera=0.0),
+    }
+    for metodo, fn in lotes.items():
+        t1 = _medir_mediana(root, entry, fn, 'x', repeticiones)
+        if t1 is None:
+            continue
+        tn = _medir_mediana(root, entry, fn, 'x' * n, repeticiones)
+        if tn is None:
+            continue
+        por_char = max(0.0, (tn - t1) / (n - 1))
+        costes[metodo] = {'llamada': max(0.0, t1 - por_char), 'por_char': por_char, 'pegado': 0.0}
+        medidos.add(metodo)
+
+    if 'clipboard' not in medidos:
+        return costes
+
+    # Separar la parte fija del portapapeles: copiar (llamada) vs. pegar (latencia)
+    copias = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        try:
+            _copiar_portapapeles('x')
+        except OSError:
+            costes['clipboard'] = dict(COSTES_POR_DEFECTO['clipboard'])
+            return costes
+        copias.append(time.perf_counter() - t0)
+    t_copia = statistics.median(copias)
+    fijo = costes['clipboard']['llamada']
+    costes['clipboard']['llamada'] = min(t_copia, fijo)
+    costes['clipboard']['pegado'] = fijo - costes['clipboard']['llamada']
+    return costes
+
+
 def calibrar(root, estado_callback=None):
     """
-    Auto-calibración: prueba cada carácter con los dos métodos,
-    elige el que funciona, y guarda los resultados.
-    Retorna (mapa, errores).
+    Auto-calibración: prueba cada carácter con los tres métodos,
+    elige el que funciona, mide el coste de cada método y guarda los resultados.
+    Retorna (mapa, errores, costes).
     """
     test_win = tk.Toplevel(root)
     test_win.title("Calibrando teclado...")
@@ -273,12 +418,18 @@ def calibrar(root, estado_callback=None):
         resultado_map[char] = 'clipboard'  # fallback más seguro
         errores.append((char, got1, got2))
 
+    lbl.config(text="Midiendo velocidad de cada método...")
+    if estado_callback:
+        estado_callback("Midiendo velocidad de cada método...")
+    costes = _medir_costes(root, test_entry)
+
     test_win.destroy()
     root.update()
 
     # Guardar
     _guardar_calibracion(resultado_map)
-    return resultado_map, errores
+    _guardar_costes(costes)
+    return resultado_map, errores, costes
 
 
 def _guardar_calibracion(mapa):
@@ -307,6 +458,36 @@ def _guardar_perfil(data, entorno_id=None):
         pass
 
 
+def _guardar_costes(costes, entorno_id=None):
+    """Guarda los costes medidos de cada método para un entorno específico."""
+    if entorno_id is None:
+        entorno_id = _obtener_id_entorno()
+    os.makedirs(COSTES_DIR, exist_ok=True)
+    path = os.path.join(COSTES_DIR, f"{entorno_id}.json")
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(costes, f, indent=2)
+    except Exception:
+        pass
+
+
+def _cargar_costes(entorno_id=None):
+    """Carga los costes medidos del entorno, completando con los valores por defecto."""
+    if entorno_id is None:
+        entorno_id = _obtener_id_entorno()
+    costes = {m: dict(c) for m, c in COSTES_POR_DEFECTO.items()}
+    path = os.path.join(COSTES_DIR, f"{entorno_id}.json")
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for metodo, valores in json.load(f).items():
+                    if metodo in costes:
+                        costes[metodo].update(valores)
+        except Exception:
+            pass
+    return costes
+
+
 def _cargar_calibracion():
     """Carga la calibración del perfil del entorno actual. Si no existe, intenta el archivo general."""
     entorno_id = _obtener_id_entorno()
@@ -342,26 +523,73 @@ def _listar_perfiles():
 # Método 3: Clipboard — pegar vía portapapeles (funciona SIEMPRE)
 # ═════════════════════════════════════════════════════════════
 
-def _enviar_clipboard(char):
-    """Envía un carácter copiándolo al portapapeles y pegándolo con Ctrl+V."""
+def _abrir_portapapeles(intentos=20, espera=0.01):
+    """
+    Abre el portapapeles reintentando unos instantes: rdpclip o un gestor de
+    portapapeles pueden tenerlo abierto brevemente. Lanza OSError si no lo consigue.
+    """
+    for _ in range(intentos):
+        if ctypes.windll.user32.OpenClipboard(0):
+            return
+        time.sleep(espera)
+    raise OSError("No se pudo abrir el portapapeles (lo tiene otra aplicación)")
+
+
+def _copiar_portapapeles(texto):
+    """Copia un texto al portapapeles como CF_UNICODETEXT. Lanza OSError si falla."""
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    ctypes.windll.user32.SetClipboardData.restype = wintypes.HANDLE
+    ctypes.windll.user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+
+    text_bytes = texto.encode('utf-16-le') + b'\x00\x00'
+    h_mem = kernel32.GlobalAlloc(0x0042, len(text_bytes))
+    if not h_mem:
+        raise OSError("No se pudo reservar memoria para el portapapeles")
+    p_mem = kernel32.GlobalLock(h_mem)
+    if not p_mem:
+        kernel32.GlobalFree(h_mem)
+        raise OSError("No se pudo bloquear la memoria del portapapeles")
+    ctypes.memmove(p_mem, text_bytes, len(text_bytes))
+    kernel32.GlobalUnlock(h_mem)
+
+    try:
+        _abrir_portapapeles()
+    except OSError:
+        kernel32.GlobalFree(h_mem)
+        raise
     try:
-        ctypes.windll.user32.OpenClipboard(0)
-        ctypes.windll.user32.EmptyClipboard()
-        # CF_UNICODETEXT = 13
-        text_bytes = char.encode('utf-16-le') + b'\x00\x00'
-        h_mem = ctypes.windll.kernel32.GlobalAlloc(0x0042, len(text_bytes))
-        p_mem = ctypes.windll.kernel32.GlobalLock(h_mem)
-        ctypes.memmove(p_mem, text_bytes, len(text_bytes))
-        ctypes.windll.kernel32.GlobalUnlock(h_mem)
-        ctypes.windll.user32.SetClipboardData(13, h_mem)
+        if not ctypes.windll.user32.EmptyClipboard():
+            kernel32.GlobalFree(h_mem)
+            raise OSError("No se pudo vaciar el portapapeles")
+        # CF_UNICODETEXT = 13. Si tiene éxito, la memoria pasa a ser del sistema.
+        if not ctypes.windll.user32.SetClipboardData(13, h_mem):
+            kernel32.GlobalFree(h_mem)
+            raise OSError("No se pudo escribir en el portapapeles")
+    finally:
         ctypes.windll.user32.CloseClipboard()
 
+
+def _enviar_clipboard(texto, espera=0.02):
+    """
+    Envía un carácter (o un texto completo) copiándolo al portapapeles y pegándolo con Ctrl+V.
+    Tras el pegado espera `espera` segundos para que la ventana destino lo procese
+    antes de que el portapapeles se vuelva a sobrescribir.
+    Si la copia falla no se pulsa Ctrl+V (pegaría otro contenido) y retorna False.
+    """
+    try:
+        _copiar_portapapeles(texto)
+
         # Simular Ctrl+V
         _key_event(VK_CONTROL, up=False)
         _key_event(0x56, up=False)   # V
         _key_event(0x56, up=True)
         _key_event(VK_CONTROL, up=True)
-        time.sleep(0.02)
+        time.sleep(espera)
         return True
     except Exception:
         return False
@@ -401,6 +629,210 @@ def enviar_char(char):
         _enviar_unicode(char)
 
 
+# ═════════════════════════════════════════════════════════════
+# Planificador por costes (segmenta el texto por el transporte más rápido)
+# ═════════════════════════════════════════════════════════════
+
+METODOS_PLAN = ('unicode', 'vkscan', 'clipboard')
+
+# Costes en segundos. Se sustituyen por los medidos al calibrar.
+#   llamada:  sobrecarga fija por cada llamada (SendInput / abrir portapapeles)
+#   por_char: coste adicional por cada carácter del segmento
+#   pegado:   latencia fija del Ctrl+V (solo portapapeles)
+COSTES_POR_DEFECTO = {
+    'unicode':   {'llamada': 0.0005, 'por_char': 0.0002, 'pegado': 0.0},
+    'vkscan':    {'llamada': 0.0005, 'por_char': 0.0006, 'pegado': 0.0},
+    'clipboard': {'llamada': 0.003, 'por_char': 0.00002, 'pegado': 0.03},
+}
+
+_costes_metodo = {m: dict(c) for m, c in COSTES_POR_DEFECTO.items()}
+
+# Caracteres máximos por llamada a SendInput (≈100-400 INPUT). Permite que
+# DETENER/Escape interrumpan entre lotes en segmentos largos.
+LOTE_MAX_CHARS = 50
+
+# Margen mínimo para que la ventana destino procese un Ctrl+V antes de volver
+# a sobrescribir el portapapeles (fijo + proporcional al texto pegado)
+ESPERA_PEGADO_MIN = 0.02
+ESPERA_PEGADO_POR_CHAR = 0.00002
+
+
+def _metodos_validos(char):
+    """
+    Métodos que escriben `char` correctamente según la calibración. Ignora el método
+    forzado del selector: el modo plan siempre se rige por la calibración.
+    El portapapeles funciona siempre; VkScan solo si la calibración lo eligió, porque
+    en algunos layouts produce teclas muertas en lugar del carácter.
+    """
+    if char == '\n':
+        return ('vkscan', 'clipboard')
+
+    metodo = _metodo_por_char.get(char, 'unicode')
+    if metodo == 'vkscan':
+        return ('vkscan', 'clipboard')
+    if metodo == 'clipboard':
+        return ('clipboard',)
+    return ('unicode', 'clipboard')
+
+
+def _espera_pegado(n, costes):
+    """Espera tras pegar `n` caracteres: latencia medida con los márgenes mínimos."""
+    c = costes['clipboard']
+    return (max(c.get('pegado', 0.0), ESPERA_PEGADO_MIN)
+            + n * max(c.get('por_char', 0.0), ESPERA_PEGADO_POR_CHAR))
+
+
+def _coste_fijo(metodo, costes):
+    """Coste que se paga una vez por segmento: llamada más la parte fija de la espera del pegado."""
+    c = costes[metodo]
+    if metodo == 'clipboard':
+        return c.get('llamada', 0.0) + _espera_pegado(0, costes)
+    return c.get('llamada', 0.0) + c.get('pegado', 0.0)
+
+
+def _coste_por_char(metodo, costes):
+    """Coste adicional por cada carácter del segmento."""
+    if metodo == 'clipboard':
+        return _espera_pegado(1, costes) - _espera_pegado(0, costes)
+    return costes[metodo].get('por_char', 0.0)
+
+
+def _coste_segmento(metodo, n, costes):
+    """
+    Tiempo estimado para enviar `n` caracteres en un solo segmento con `metodo`.
+    Unicode y VkScan hacen una llamada por cada lote de LOTE_MAX_CHARS caracteres.
+    """
+    coste = _coste_fijo(metodo, costes) + n * _coste_por_char(metodo, costes)
+    if metodo != 'clipboard':
+        lotes_extra = max(0, -(-n // LOTE_MAX_CHARS) - 1)
+        coste += lotes_extra * costes[metodo].get('llamada', 0.0)
+    return coste
+
+
+def planificar(texto, costes=None, pausa=0.0):
+    """
+    Divide el texto en segmentos [(metodo, segmento), ...] minimizando el tiempo total.
+    Programación dinámica sobre el estado (método, posición en el lote actual): cada
+    carácter continúa el segmento actual (paga por_char, y la llamada cuando empieza
+    un lote nuevo de LOTE_MAX_CHARS) o abre uno nuevo (paga además la llamada, en el
+    portapapeles la espera del pegado, y la `pausa` entre segmentos).
+    """
+    if costes is None:
+        costes = _costes_metodo
+    if not texto:
+        return []
+
+    estados = [('clipboard', 0)] + [(m, r) for m in METODOS_PLAN if m != 'clipboard'
+                                    for r in range(LOTE_MAX_CHARS)]
+    inf = float('inf')
+    # mejor[(m, r)]: coste mínimo hasta el carácter actual, que es el r-ésimo de un lote de m
+    mejor = {e: inf for e in estados}
+    # origen[i][(m, r)]: estado del carácter i-1 en el camino óptimo que termina en (m, r)
+    origen = []
+
+    for char in texto:
+        validos = _metodos_validos(char)
+        arg_prev = min(mejor, key=mejor.get) if origen else None
+        min_prev = mejor[arg_prev] if origen else 0.0
+        nuevo = {}
+        paso = {}
+        for m, r in estados:
+            if m not in validos:
+                nuevo[(m, r)], paso[(m, r)] = inf, None
+                continue
+            if m == 'clipboard':
+                prev, extra = (m, 0), 0.0
+            else:
+                prev = (m, (r - 1) % LOTE_MAX_CHARS)
+                extra = costes[m].get('llamada', 0.0) if r == 0 else 0.0
+            seguir = mejor[prev] + extra
+            abrir = inf
+            if r == 0:
+                abrir = min_prev + _coste_fijo(m, costes) + (pausa if origen else 0.0)
+            if seguir <= abrir:
+                nuevo[(m, r)], paso[(m, r)] = seguir, prev
+            else:
+                nuevo[(m, r)], paso[(m, r)] = abrir, arg_prev
+            nuevo[(m, r)] += _coste_por_char(m, costes)
+        mejor = nuevo
+        origen.append(paso)
+
+    # Reconstruir el método de cada carácter
+    estado = min(mejor, key=mejor.get)
+    metodos = []
+    for paso in reversed(origen):
+        metodos.append(estado[0])
+        estado = paso[estado]
+    metodos.reverse()
+
+    # Agrupar caracteres consecutivos con el mismo método
+    plan = []
+    for char, m in zip(texto, metodos):
+        if plan and plan[-1][0] == m:
+            plan[-1][1].append(char)
+        else:
+            plan.append((m, [char]))
+    return [(m, ''.join(chars)) for m, chars in plan]
+
+
+def estimar_duracion(plan, costes=None, pausa=0.0):
+    """Duración estimada de un plan; `pausa` se aplica entre segmentos."""
+    if costes is None:
+        costes = _costes_metodo
+    total = sum(_coste_segmento(m, len(seg), costes) for m, seg in plan)
+    return total + pausa * max(0, len(plan) - 1)
+
+
+def informe_plan(texto, costes=None, pausa=0.0, max_segmentos=25):
+    """Genera el informe de simulación (dry-run): plan elegido y duración estimada."""
+    if costes is None:
+        costes = _costes_metodo
+    plan = planificar(texto, costes, pausa)
+
+    lineas = [f"{len(plan)} segmentos para {len(texto)} caracteres:", ""]
+    for i, (metodo, seg) in enumerate(plan[:max_segmentos], 1):
+        muestra = seg if len(seg) <= 24 else seg[:21] + '...'
+        muestra = muestra.replace('\n', '⏎').replace('\t', '⇥')
+        lineas.append(f"  {i:>3}. {metodo:<9} {len(seg):>5} car.  "
+                      f"~{_coste_segmento(metodo, len(seg), costes) * 1000:.1f} ms  '{muestra}'")
+    if len(plan) > max_segmentos:
+        lineas.append(f"  ... y {len(plan) - max_segmentos} segmentos más")
+
+    # Referencia: escritura carácter a carácter con el método calibrado
+    por_char = sum(_coste_segmento(_metodos_validos(c)[0], 1, costes) + pausa for c in texto)
+    lineas += [
+        "",
+        f"Duración estimada del plan: {estimar_duracion(plan, costes, pausa):.3f} s",
+        f"Carácter a carácter (auto): {por_char:.3f} s",
+    ]
+    return '\n'.join(lineas)
+
+
+def trocear_segmento(metodo, segmento):
+    """Divide un segmento en lotes de como mucho LOTE_MAX_CHARS (el portapapeles va entero)."""
+    if metodo == 'clipboard':
+        return [segmento]
+    return [segmento[i:i + LOTE_MAX_CHARS] for i in range(0, len(segmento), LOTE_MAX_CHARS)]
+
+
+def enviar_segmento(metodo, segmento):
+    """
+    Envía un segmento (o un lote de él) con una sola llamada del método indicado.
+    Tras un pegado espera a que la ventana destino lo haya procesado (la misma
+    espera que cuenta el planificador), para no sustituir el portapapeles a medias.
+    Retorna False si el segmento no se pudo enviar (p. ej. portapapeles ocupado).
+    """
+    if metodo == 'clipboard':
+        espera = _espera_pegado(len(segmento), _costes_metodo)
+        if not _enviar_clipboard(segmento.replace('\n', '\r\n'), espera=espera):
+            return False
+    elif metodo == 'vkscan':
+        _enviar_vkscan_lote(segmento)
+    else:
+        _enviar_unicode_lote(segmento)
+    return True
+
+
 # ═════════════════════════════════════════════════════════════
 # Interfaz gráfica
 # ═════════════════════════════════════════════════════════════
@@ -409,7 +841,7 @@ class TecladoSimulador:
     def __init__(self, root):
         self.root = root
         self.root.title("Simulador de Teclado")
-        self.root.geometry("620x780")
+        self.root.geometry("620x830")
         self.root.resizable(False, False)
         self.root.configure(bg="#1e1e2e")
 
@@ -421,6 +853,7 @@ class TecladoSimulador:
         cal, self.entorno_id = _cargar_calibracion()
         if cal:
             _metodo_por_char.update(cal)
+        _costes_metodo.update(_cargar_costes(self.entorno_id))
 
         self._crear_interfaz()
 
@@ -475,14 +908,14 @@ class TecladoSimulador:
         default_metodo = "auto" if not self.es_remoto else "vkscan"
         self.metodo_var = tk.StringVar(value=default_metodo)
         metodo_combo = ttk.Combobox(frame_config, textvariable=self.metodo_var,
-                                     values=["auto", "unicode", "vkscan", "clipboard"],
+                                     values=["auto", "plan", "unicode", "vkscan", "clipboard"],
                                      state="readonly", width=12,
                                      font=("Segoe UI", 10))
         metodo_combo.grid(row=2, column=1, padx=(8, 0), pady=2)
         metodo_combo.bind("<<ComboboxSelected>>", self._cambiar_metodo)
         # Aplicar el método forzado por defecto (sin tocar estado_var aún)
         global _metodo_forzado
-        _metodo_forzado = None if default_metodo == 'auto' else default_metodo
+        _metodo_forzado = None if default_metodo in ('auto', 'plan') else default_metodo
 
         # ── Info del entorno ──
         entorno_txt = f"{'🖥 REMOTO (RDP)' if self.es_remoto else '💻 Local'} — {self.entorno_id}"
@@ -514,7 +947,14 @@ class TecladoSimulador:
                                       bg="#89b4fa", fg="#1e1e2e", activebackground="#74c7ec",
                                       width=22, cursor="hand2", relief="flat",
                                       command=self._calibrar)
-        self.btn_calibrar.pack()
+        self.btn_calibrar.pack(pady=(0, 6))
+
+        self.btn_simular = tk.Button(frame_botones, text="📄  SIMULAR PLAN",
+                                     font=("Segoe UI", 10, "bold"),
+                                     bg="#f9e2af", fg="#1e1e2e", activebackground="#fab387",
+                                     width=22, cursor="hand2", relief="flat",
+                                     command=self._simular_plan)
+        self.btn_simular.pack()
 
         # ── Estado ──
         cal, _ = _cargar_calibracion()
@@ -543,11 +983,12 @@ class TecladoSimulador:
         sel = self.metodo_var.get()
         descripciones = {
             'auto':      "Auto: elige por carácter según calibración",
+            'plan':      "Plan: agrupa el texto en segmentos por el método más rápido",
             'unicode':   "Unicode: envía scan codes (ideal en local)",
             'vkscan':    "VkScan: simula teclas reales (ideal en RDP)",
             'clipboard': "Clipboard: pega vía Ctrl+V (funciona siempre, más lento)",
         }
-        _metodo_forzado = None if sel == 'auto' else sel
+        _metodo_forzado = None if sel in ('auto', 'plan') else sel
         self.estado_var.set(f"Método: {descripciones.get(sel, sel)}")
 
     # ── Advertencia RDP ──
@@ -569,11 +1010,13 @@ class TecladoSimulador:
         self.btn_iniciar.config(state="disabled")
         self.btn_calibrar.config(state="disabled")
         self.btn_detener.config(state="disabled")
+        self.btn_simular.config(state="disabled")
         self.estado_var.set(f"Calibrando para '{self.entorno_id}'... no toques nada.")
 
         def run():
-            mapa, errores = calibrar(self.root, lambda msg: self.estado_var.set(msg))
+            mapa, errores, costes = calibrar(self.root, lambda msg: self.estado_var.set(msg))
             _metodo_por_char.update(mapa)
+            _costes_metodo.update(costes)
 
             n_unicode = sum(1 for v in mapa.values() if v == 'unicode')
             n_vkscan = sum(1 for v in mapa.values() if v == 'vkscan')
@@ -587,6 +1030,7 @@ class TecladoSimulador:
             self.estado_var.set(msg)
             self.btn_iniciar.config(state="normal")
             self.btn_calibrar.config(state="normal")
+            self.btn_simular.config(state="normal")
 
             if errores:
                 detalle = "\n".join(
@@ -600,6 +1044,22 @@ class TecladoSimulador:
 
         self.root.after(200, run)
 
+    # ── Simulación del plan (dry-run) ──
+
+    def _simular_plan(self):
+        contenido = self.texto.get("1.0", "end-1c")
+        if not contenido.strip():
+            messagebox.showwarning("Sin texto", "Escribe algo en el área de texto antes de simular.")
+            return
+
+        try:
+            velocidad = float(self.velocidad_var.get())
+        except ValueError:
+            messagebox.showerror("Error", "El valor de velocidad debe ser numérico.")
+            return
+
+        messagebox.showinfo("Plan de escritura", informe_plan(contenido, pausa=velocidad))
+
     # ── Escritura ──
 
     def _iniciar(self):
@@ -620,18 +1080,25 @@ class TecladoSimulador:
         self.btn_detener.config(state="normal")
         self.btn_calibrar.config(state="disabled")
 
-        hilo = threading.Thread(target=self._escribir,
+        objetivo = self._escribir_plan if self.metodo_var.get() == 'plan' else self._escribir
+        hilo = threading.Thread(target=objetivo,
                                 args=(contenido, delay, velocidad),
                                 daemon=True)
         hilo.start()
 
-    def _escribir(self, texto, delay, velocidad):
+    def _cuenta_regresiva(self, delay):
+        """Cuenta regresiva antes de escribir. Retorna False si el usuario canceló."""
         for i in range(delay, 0, -1):
             if not self.escribiendo:
                 self._restablecer("Cancelado.")
-                return
+                return False
             self.estado_var.set(f"⏳ Escribiendo en {i} segundos... ¡Cambia a la ventana destino!")
             time.sleep(1)
+        return True
+
+    def _escribir(self, texto, delay, velocidad):
+        if not self._cuenta_regresiva(delay):
+            return
 
         self.estado_var.set("✍️ Escribiendo...")
         pyautogui.FAILSAFE = True
@@ -652,6 +1119,28 @@ class TecladoSimulador:
 
         self._restablecer("✅ ¡Texto escrito correctamente!")
 
+    def _escribir_plan(self, texto, delay, velocidad):
+        """Escribe el texto segmento a segmento según el plan; la pausa se aplica entre segmentos."""
+        plan = planificar(texto, pausa=velocidad)
+        if not self._cuenta_regresiva(delay):
+            return
+
+        for i, (metodo, segmento) in enumerate(plan, 1):
+            if i > 1:
+                time.sleep(velocidad)
+            self.estado_var.set(f"✍️ Escribiendo segmento {i}/{len(plan)} ({metodo}, {len(segmento)} car.)...")
+
+            for lote in trocear_segmento(metodo, segmento):
+                if not self.escribiendo:
+                    self._restablecer("Detenido por el usuario.")
+                    return
+                if not enviar_segmento(metodo, lote):
+                    self._restablecer(f"❌ Error en el segmento {i}/{len(plan)} ({metodo}): "
+                                      "no se pudo usar el portapapeles. El texto quedó incompleto.")
+                    return
+
+        self._restablecer("✅ ¡Texto escrito correctamente!")
+
     def _detener(self):
         self.escribiendo = False
 